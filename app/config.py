@@ -1,8 +1,9 @@
 import os
-from pydantic import BaseSettings
+from dataclasses import dataclass
 
 
-class Settings(BaseSettings):
+@dataclass(frozen=True, slots=True)
+class Settings:
     EMAIL: str = os.getenv("EMAIL", "23f3002873@ds.study.iitm.ac.in")
     SECRET: str = os.getenv("SECRET", "34595561cea24b71e0a770c18378bbdd0176440f16b7dbf9fdca6cc07866266a")
 
@@ -19,5 +20,10 @@ class Settings(BaseSettings):
     TIMEOUT_SECONDS: int = int(os.getenv("TIMEOUT_SECONDS", "180"))
     MAX_PAYLOAD_BYTES: int = int(os.getenv("MAX_PAYLOAD_BYTES", "1000000"))
 
+    DEBUG: bool = os.getenv("DEBUG", "0").lower() in ("1", "true", "yes")
+
 
 settings = Settings()
+
+# Encoded once at import so the per-request secret check only encodes the input.
+SECRET_BYTES = settings.SECRET.encode("utf-8")
@@ -1,10 +1,61 @@
+import hmac
+import logging
+import queue
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
-from app.config import settings
+from app.config import SECRET_BYTES, settings
+from solver.browser_pool import close_browser, get_browser
+from solver.http_client import close_http_client, get_http_client
 from solver.solver import QuizSolver
 
-app = FastAPI(title="LLM Analysis Quiz Endpoint")
+logger = logging.getLogger("app")
+
+
+def _start_log_listener() -> QueueListener:
+    """
+    Routes all log records through a queue so handlers never block the
+    event loop on stdout; a background thread does the actual writes.
+    """
+    log_queue = queue.Queue(-1)
+    root = logging.getLogger()
+    root.handlers = [QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    # DEBUG only for our own loggers; httpx/hpack debug output is very noisy.
+    for name in ("app", "solver"):
+        logging.getLogger(name).setLevel(logging.DEBUG if settings.DEBUG else logging.INFO)
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_listener = _start_log_listener()
+    # Process-wide HTTP client and Chromium, created up front so the first
+    # quiz doesn't pay for them; each solver run only opens its own context.
+    get_http_client()
+    await get_browser()
+    try:
+        yield
+    finally:
+        await close_browser()
+        await close_http_client()
+        log_listener.stop()
+
+
+app = FastAPI(
+    title="LLM Analysis Quiz Endpoint",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 @app.get("/health")
@@ -18,14 +69,29 @@ async def quiz_endpoint(req: Request):
     Production quiz handler — validates input, verifies secret,
     runs the solver, and returns the solver result.
     """
+    # Reject oversized bodies before buffering or parsing them
+    try:
+        content_length = int(req.headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if content_length > settings.MAX_PAYLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Payload too large")
+
+    # Chunked bodies carry no Content-Length, so cap while streaming too
+    body = bytearray()
+    async for chunk in req.stream():
+        body += chunk
+        if len(body) > settings.MAX_PAYLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Payload too large")
+
     # Parse JSON
     try:
-        payload = await req.json()
-    except Exception:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON")
 
     # Validate required fields
-    if not all(k in payload for k in ("email", "secret", "url")):
+    if not isinstance(payload, dict) or not all(k in payload for k in ("email", "secret", "url")):
         raise HTTPException(status_code=400, detail="Missing fields")
 
     email = payload["email"]
@@ -33,7 +99,7 @@ async def quiz_endpoint(req: Request):
     url = payload["url"]
 
     # Verify secret
-    if secret != settings.SECRET:
+    if not isinstance(secret, str) or not hmac.compare_digest(secret.encode("utf-8"), SECRET_BYTES):
         raise HTTPException(status_code=403, detail="Invalid secret")
 
     # Run solver
@@ -41,14 +107,14 @@ async def quiz_endpoint(req: Request):
         email=email,
         secret=secret,
         start_url=url,
-        timeout=settings.TIMEOUT_SECONDS
+        timeout=settings.TIMEOUT_SECONDS,
     )
 
     try:
         result = await solver.run()
-    except Exception as e:
-        # Logable by Render, but return a generic 500 message
-        # (Render logs will still show the exception trace if present)
+    except Exception:
+        # Log the trace for Render, but return a generic 500 message
+        logger.exception("Solver failed for %s", url)
         raise HTTPException(status_code=500, detail="Solver failed to run")
 
-    return JSONResponse(status_code=200, content=result)
+    return ORJSONResponse(status_code=200, content=result)
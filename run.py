@@ -0,0 +1,20 @@
+import os
+import sys
+
+import uvicorn
+
+
+if __name__ == "__main__":
+    # --reload and --workers are mutually exclusive; DEV=1 trades workers for reload.
+    dev = os.getenv("DEV") == "1"
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        # uvloop has no Windows build; fall back to the stock asyncio loop there.
+        loop="uvloop" if sys.platform != "win32" else "asyncio",
+        http="httptools",
+        reload=dev,
+        workers=1 if dev else int(os.getenv("UVICORN_WORKERS", "1")),
+    )
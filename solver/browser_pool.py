@@ -0,0 +1,45 @@
+import asyncio
+from typing import Optional
+
+from playwright.async_api import Browser, Playwright, async_playwright
+
+
+# The browser only scrapes text: no sandbox (root in Docker), no /dev/shm
+# (tiny in containers), and no GPU, extensions or image decoding.
+CHROMIUM_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--blink-settings=imagesEnabled=false",
+]
+
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+_lock = asyncio.Lock()
+
+
+async def get_browser() -> Browser:
+    """
+    Returns the process-wide Chromium instance, launching it on first use.
+    Concurrent first callers share one launch.
+    """
+    global _playwright, _browser
+    async with _lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        return _browser
+
+
+async def close_browser() -> None:
+    """Closes the shared browser and stops Playwright; safe to call twice."""
+    global _playwright, _browser
+    async with _lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
@@ -0,0 +1,36 @@
+from typing import Optional
+
+import httpx
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide HTTP client, creating it on first use. One pool
+    means submit POSTs and file downloads reuse HTTP/2 connections across
+    quiz legs and across requests.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            # Fail fast on unreachable hosts; reads (downloads) keep the full 30 s.
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=50,
+                max_connections=100,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Closes the shared client; safe to call twice."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,57 +1,261 @@
 import asyncio
-from playwright.async_api import async_playwright
+from playwright.async_api import Browser, TimeoutError as PlaywrightTimeoutError
 import httpx
+import orjson
 import re
-import json
 import base64
-import tempfile
-import os
+import io
+import logging
+import math
 import time
-from typing import Optional
+from typing import BinaryIO, Optional
+from urllib.parse import urlsplit
 
-import pandas as pd
+import numpy as np
 import pdfplumber
+import pymupdf
+
+from solver.browser_pool import get_browser
+from solver.http_client import get_http_client
+
+
+logger = logging.getLogger("solver")
+
+# Installed in every page before its own scripts run: counts in-flight
+# fetch/XHR requests so the solver can tell when JS-driven rendering settles.
+_QUIESCENCE_INIT_JS = """(() => {
+    window.__pwPending = 0;
+    const begin = () => { window.__pwPending++; window.__pwLastActivity = Date.now(); };
+    const end = () => {
+        window.__pwPending = Math.max(0, window.__pwPending - 1);
+        window.__pwLastActivity = Date.now();
+    };
+    if (window.fetch) {
+        const origFetch = window.fetch;
+        window.fetch = function (...args) {
+            begin();
+            try {
+                return origFetch.apply(this, args).finally(end);
+            } catch (e) {
+                end();
+                throw e;
+            }
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        begin();
+        this.addEventListener("loadend", end, { once: true });
+        try {
+            return origSend.apply(this, args);
+        } catch (e) {
+            // e.g. InvalidStateError on an unopened XHR: loadend never fires.
+            end();
+            throw e;
+        }
+    };
+})();"""
+
+# True once no request is in flight and none has finished in the last 300 ms.
+_QUIESCENT_JS = "() => !window.__pwPending && Date.now() - (window.__pwLastActivity || 0) > 300"
+
+# Resource types not needed to scrape text, scripts, forms and links.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Installed in every page alongside the quiescence hook: window.__findSubmit()
+# runs the submit-URL heuristics in V8, in priority order, and returns the
+# first hit (or null) in a single CDP round-trip. HTML and script scans are
+# capped at LIMIT characters.
+_FIND_SUBMIT_INIT_JS = r"""window.__findSubmit = () => {
+    const LIMIT = 200000;
+    const all = (sel) => Array.from(document.querySelectorAll(sel));
+    const hasSubmit = (s) => typeof s === "string" && s.includes("/submit");
+    let m;
+
+    const html = document.documentElement.outerHTML.slice(0, LIMIT);
+    if (hasSubmit(html)) {
+        m = html.match(/https?:\/\/[\w./:?=&\-]+\/submit[\w./:?=&\-]*/);
+        if (m) return m[0];
+    }
+
+    const form = all("form").map(f => f.action || f.getAttribute("action")).find(hasSubmit);
+    if (form) return form;
+
+    const dataSubmit = document.querySelector("[data-submit]");
+    if (dataSubmit && dataSubmit.getAttribute("data-submit")) return dataSubmit.getAttribute("data-submit");
+
+    const anchor = all("a").map(e => e.href || e.getAttribute("href")).filter(Boolean).slice(0, 200).find(hasSubmit);
+    if (anchor) return anchor;
+
+    const scripts = all("script").map(s => s.innerText).filter(Boolean).join(" ").slice(0, LIMIT);
+    if (hasSubmit(scripts)) {
+        m = scripts.match(/fetch\(['"](https?:\/\/[^'"\)]+\/submit[^'"\)]*)['"]/);
+        if (m) return m[1];
+        m = scripts.match(/https?:\/\/[^'"\s]+\/submit[^'"\s]*/);
+        if (m) return m[0];
+    }
+
+    const origin = document.querySelector("span.origin");
+    if (origin) return (origin.textContent || location.origin).replace(/\/+$/, "") + "/submit";
+
+    const meta = all("meta[http-equiv='refresh'], meta[http-equiv='Refresh']")
+        .map(e => e.getAttribute("content")).find(hasSubmit);
+    return meta || null;
+};"""
+
+_FIND_SUBMIT_JS = "() => window.__findSubmit ? window.__findSubmit() : null"
+
+# Last-resort submit-URL pattern, run in Python over the serialized page.
+# Works on UTF-8 bytes: cheaper per position than str.
+_SUBMIT_BODY_RE = re.compile(rb"(https?://[^\s'\"<>]+/submit[^\s'\"<>]*)")
+
+# The Python fallback reads at most this much serialized HTML (256 KiB); the
+# slice happens in the page so a huge DOM never crosses CDP in full.
+_MAX_FALLBACK_HTML_CHARS = 262_144
+_FALLBACK_HTML_JS = f"() => document.documentElement.outerHTML.slice(0, {_MAX_FALLBACK_HTML_CHARS})"
+
+# Downloads are buffered in memory: cap each one, and how many are in flight.
+_MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+_MAX_CONCURRENT_DOWNLOADS = 4
+
+# Visible text, link targets and <pre> texts: the per-leg DOM snapshot.
+_PAGE_TEXT_JS = """() => ({
+    text: document.body ? document.body.innerText : "",
+    links: Array.from(document.querySelectorAll("a")).map(e => e.href),
+    pres: Array.from(document.querySelectorAll("pre")).map(e => e.innerText),
+})"""
+
+# Answer extraction from <pre> blocks and JSON-ish text.
+_ANSWER_JSON_RE = re.compile(r'"answer"\s*:\s*"([^"]*)"')
+_ANSWER_LOOSE_RE = re.compile(r'["\']?answer["\']?\s*[:=]\s*["\']?([^"\',\}\]]+)', re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_B64_RE = re.compile(r"[A-Za-z0-9+/]+={0,2}")
+
+# Keyword triggers for the text heuristics, matched in one case-insensitive
+# pass over the body text (no lowercase copy). Group names are trigger names.
+_TRIGGER_RE = re.compile(r"(?P<sum_of_the>sum of the)|(?P<value>value)", re.IGNORECASE)
+
+
+class _NumericCharTable(dict):
+    """
+    str.translate table that keeps digits, '.' and '-' and deletes every
+    other code point. Misses are memoised, so after warm-up each lookup is
+    a plain C-level dict hit instead of a regex engine step.
+    """
+
+    def __missing__(self, codepoint):
+        self[codepoint] = None
+        return None
+
+
+# Deletes anything that cannot be part of a plain decimal number.
+_NUM_KEEP_TABLE = _NumericCharTable({ord(c): ord(c) for c in "0123456789.-"})
+
+
+def _parse_number(cell) -> float:
+    """Parses a table cell as a number after stripping non-numeric noise; NaN if impossible."""
+    try:
+        return float(str(cell).translate(_NUM_KEEP_TABLE))
+    except ValueError:
+        return math.nan
+
+
+def _find_triggers(text: str, wanted: set) -> set:
+    """Returns which _TRIGGER_RE keywords occur in text, stopping once all wanted ones are seen."""
+    hits = set()
+    for m in _TRIGGER_RE.finditer(text):
+        hits.add(m.lastgroup)
+        if wanted <= hits:
+            break
+    return hits
+
+
+def _origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+async def _block_heavy_resources(route):
+    """Aborts requests for assets the solver never reads (DOM text only)."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
 
 
 class QuizSolver:
-    def __init__(self, email: str, secret: str, start_url: str, timeout: int = 180):
+    def __init__(
+        self,
+        email: str,
+        secret: str,
+        start_url: str,
+        timeout: int = 180,
+        *,
+        client: Optional[httpx.AsyncClient] = None,
+        browser: Optional[Browser] = None,
+    ):
         self.email = email
         self.secret = secret
         self.start_url = start_url
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Shared, process-wide client; never closed here.
+        self.client = client or get_http_client()
+        # Shared Chromium instance; defaults to the process-wide pool.
+        self.browser = browser
+        # Origin -> submit URL that accepted an answer earlier in this run.
+        self._submit_cache: dict[str, str] = {}
 
     async def run(self):
         start_time = time.time()
         next_url = self.start_url
         last_response = {"correct": False, "reason": "Not attempted"}
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context()
-
+        # Browsers are expensive and shared; contexts are cheap and per-run.
+        browser = self.browser or await get_browser()
+        context = await browser.new_context()
+        await context.route("**/*", _block_heavy_resources)
+        context.set_default_timeout(10_000)
+        await context.add_init_script(_QUIESCENCE_INIT_JS)
+        await context.add_init_script(_FIND_SUBMIT_INIT_JS)
+        try:
+            # One page for the whole run: goto() replaces its state each leg.
+            page = await context.new_page()
             while next_url and (time.time() - start_time) < self.timeout:
-                page = await context.new_page()
-                await page.goto(next_url, wait_until="networkidle")
+                # The solver only reads the DOM, so don't wait for the
+                # network to go idle; wait until the page's own fetch/XHR
+                # traffic has drained, bounded so polling pages can't hang us.
+                await page.goto(next_url, wait_until="domcontentloaded")
+                try:
+                    await page.wait_for_function(_QUIESCENT_JS, timeout=5000)
+                except PlaywrightTimeoutError:
+                    pass
 
-                json_blob = await self._find_json_in_page(page)
+                origin = _origin_of(next_url)
 
-                answer = None
-                submit_url = None
+                # Snapshot everything the solvers read from the DOM in one
+                # evaluate; the helpers below work on these strings only.
+                try:
+                    page_text = await page.evaluate(_PAGE_TEXT_JS)
+                except Exception:
+                    page_text = {"text": "", "links": [], "pres": []}
+                json_blob = self._find_json_in_pres(page_text["pres"])
 
-                submit_url = await self._find_submit_url(page)
+                answer = None
 
                 if json_blob:
                     answer = await self._solve_from_json_blob(json_blob, page)
 
                 if answer is None:
-                    try:
-                        visible_text = await page.inner_text("body")
-                    except Exception:
-                        visible_text = ""
-                    answer = await self._heuristic_solve_text(visible_text, page)
+                    answer = await self._heuristic_solve_text(page_text["text"], page_text["links"], page_text["pres"])
 
+                # Probe for the submit URL once, after solving and the load
+                # event (usually long past), so late-injected URLs are seen.
+                submit_url = self._submit_cache.get(origin)
                 if submit_url is None:
+                    try:
+                        await page.wait_for_load_state("load")
+                    except PlaywrightTimeoutError:
+                        pass
                     submit_url = await self._find_submit_url(page)
 
                 if submit_url and answer is not None:
@@ -62,17 +266,24 @@ class QuizSolver:
                         "answer": answer,
                     }
 
-                    # Diagnostic log of what we're about to send
-                    print("SUBMIT_PAYLOAD:", payload)
+                    # Diagnostic log of what we're about to send (never the secret)
+                    logger.info("SUBMIT url=%s submit_url=%s answer=%r", next_url, submit_url, answer)
 
                     try:
-                        resp = await self.client.post(submit_url, json=payload)
+                        resp = await self.client.post(
+                            submit_url,
+                            content=orjson.dumps(payload),
+                            headers={"Content-Type": "application/json"},
+                        )
                         resp.raise_for_status()
-                        parsed = resp.json()
+                        parsed = orjson.loads(resp.content)
+                        # The endpoint took our POST, so later legs on this
+                        # origin can skip submit-URL discovery.
+                        self._submit_cache[origin] = submit_url
                         last_response = parsed
                         next_url = parsed.get("url")
                     except Exception as e:
-                        print("Submission failed:", e)
+                        logger.warning("Submission failed: %s", e)
                         last_response = {"correct": False, "reason": str(e)}
                         break
                 else:
@@ -81,136 +292,72 @@ class QuizSolver:
                         "reason": "Could not find submit URL or compute answer",
                     }
                     break
-
-                await page.close()
-
-            await browser.close()
-            await self.client.aclose()
+        finally:
+            # Closing the context also closes its page.
+            await context.close()
 
         return last_response
 
-    async def _find_json_in_page(self, page) -> Optional[dict]:
-        try:
-            pres = await page.query_selector_all("pre")
-            for pre in pres:
-                try:
-                    text = await pre.inner_text()
-                except Exception:
-                    continue
-
+    @staticmethod
+    def _find_json_in_pres(pres: list) -> Optional[dict]:
+        for text in pres:
+            # Cheap shape checks first: failed parses raise, and exception
+            # handling costs far more than looking at a few characters.
+            stripped = text.strip()
+            if stripped[:1] in ("{", "["):
                 try:
-                    return json.loads(text)
-                except Exception:
+                    return orjson.loads(stripped)
+                except orjson.JSONDecodeError:
                     pass
 
-                try:
-                    cleaned = re.sub(r"<[^>]+>", "", text).strip()
-                    return json.loads(cleaned)
-                except Exception:
-                    pass
+            if "<" in text:
+                cleaned = _HTML_TAG_RE.sub("", text).strip()
+                if cleaned[:1] in ("{", "["):
+                    try:
+                        return orjson.loads(cleaned)
+                    except orjson.JSONDecodeError:
+                        pass
 
+            compact = "".join(text.split())
+            if compact and len(compact) % 4 == 0 and _B64_RE.fullmatch(compact):
                 try:
-                    decoded = base64.b64decode(text).decode("utf-8")
-                    return json.loads(decoded)
-                except Exception:
+                    decoded = base64.b64decode(compact, validate=True).decode("utf-8")
+                    return orjson.loads(decoded)
+                except ValueError:
+                    # binascii.Error, UnicodeDecodeError and JSONDecodeError
                     pass
 
-                m = re.search(r'"answer"\s*:\s*"([^"]*)"', text)
-                if m:
-                    return {"answer": m.group(1)}
-
-                m2 = re.search(r'["\']?answer["\']?\s*[:=]\s*["\']?([^"\',\}\]]+)', text, flags=re.IGNORECASE)
-                if m2:
-                    return {"answer": m2.group(1).strip()}
-        except Exception:
-            return None
-        return None
-
-    async def _find_submit_url(self, page) -> Optional[str]:
-        try:
-            body = await page.content()
-        except Exception:
-            return None
-
-        try:
-            pattern = r"https?://[\w./:?=&\-]+/submit[\w./:?=&\-]*"
-            m = re.search(pattern, body)
+            m = _ANSWER_JSON_RE.search(text)
             if m:
-                return m.group(0)
-        except Exception:
-            pass
-
-        try:
-            actions = await page.eval_on_selector_all(
-                "form",
-                "forms => forms.map(f => f.action || f.getAttribute('action')).filter(Boolean)"
-            )
-            for a in actions:
-                if a and "/submit" in a:
-                    return a
-        except Exception:
-            pass
-
-        try:
-            element = await page.query_selector("[data-submit]")
-            if element:
-                attr = await element.get_attribute("data-submit")
-                if attr:
-                    return attr
-        except Exception:
-            pass
-
-        try:
-            anchors = await page.eval_on_selector_all(
-                "a",
-                "els => els.map(e => e.href || e.getAttribute('href')).filter(Boolean).slice(0,200)"
-            )
-            for a in anchors:
-                if a and "/submit" in a:
-                    return a
-        except Exception:
-            pass
+                return {"answer": m.group(1)}
 
-        try:
-            scripts = await page.eval_on_selector_all("script", "scripts => scripts.map(s => s.innerText).filter(Boolean)")
-            joined = " ".join(scripts)[:200000]
-            m2 = re.search(r"fetch\(['\"](https?://[^'\"\)]+/submit[^'\"\)]*)['\"]", joined)
+            m2 = _ANSWER_LOOSE_RE.search(text)
             if m2:
-                return m2.group(1)
-            m3 = re.search(r"https?://[^'\"\s]+/submit[^'\"\s]*", joined)
-            if m3:
-                return m3.group(0)
-        except Exception:
-            pass
-
-        try:
-            has_origin = await page.eval_on_selector("span.origin", "s => !!s")
-            if has_origin:
-                try:
-                    origin = await page.evaluate("() => (document.querySelector('span.origin') || {}).textContent || location.origin")
-                    if origin:
-                        origin = origin.rstrip("/")
-                        return f"{origin}/submit"
-                except Exception:
-                    pass
-        except Exception:
-            pass
+                return {"answer": m2.group(1).strip()}
+        return None
 
+    async def _find_submit_url(self, page) -> Optional[str]:
+        # All DOM heuristics run in-page (see _FIND_SUBMIT_INIT_JS).
         try:
-            metas = await page.eval_on_selector_all("meta[http-equiv='refresh'], meta[http-equiv='Refresh']", "els => els.map(e => e.getAttribute('content')).filter(Boolean)")
-            for m in metas:
-                if "/submit" in (m or ""):
-                    return m
+            url = await page.evaluate(_FIND_SUBMIT_JS)
         except Exception:
-            pass
+            url = None
+        if url:
+            return url
 
+        # Fallback: loosest pattern over the (bounded) serialized HTML.
         try:
-            m4 = re.search(r"(https?://[^\s'\"<>]+/submit[^\s'\"<>]*)", body)
-            if m4:
-                return m4.group(1)
+            html = await page.evaluate(_FALLBACK_HTML_JS)
         except Exception:
-            pass
+            return None
 
+        body = html.encode("utf-8", "ignore")
+        # Every submit pattern contains the literal "/submit"; one substring
+        # scan lets pages without it skip the regex pass.
+        if b"/submit" in body:
+            m = _SUBMIT_BODY_RE.search(body)
+            if m:
+                return m.group(1).decode("utf-8")
         return None
 
     async def _solve_from_json_blob(self, blob: dict, page):
@@ -219,16 +366,17 @@ class QuizSolver:
 
         if isinstance(blob, dict):
             download_url = blob.get("url") or blob.get("file")
-            if download_url:
-                local_path = await self._download_file(download_url)
-                if local_path and local_path.lower().endswith(".pdf"):
-                    val = await self._sum_pdf_table_column(local_path)
+            # Page JSON is untrusted: url/file may be any JSON type.
+            if isinstance(download_url, str) and download_url.lower().endswith(".pdf"):
+                pdf_fp = await self._download_file(download_url)
+                if pdf_fp:
+                    val = await self._sum_pdf_table_column(pdf_fp)
                     if val is not None:
                         return val
 
         try:
             text_blob = str(blob)
-            m = re.search(r'"answer"\s*:\s*"([^"]*)"', text_blob)
+            m = _ANSWER_JSON_RE.search(text_blob)
             if m:
                 return m.group(1)
         except Exception:
@@ -236,110 +384,152 @@ class QuizSolver:
 
         return None
 
-    async def _heuristic_solve_text(self, text: str, page):
+    async def _heuristic_solve_text(self, text: str, links: list, pres: list):
         if not text:
             return None
 
-        if "sum of the" in text.lower() and "value" in text.lower():
-            try:
-                links = await page.eval_on_selector_all("a", "elements => elements.map(e => e.href)")
-            except Exception:
-                links = []
-            for link in links:
-                if link and link.lower().endswith(".pdf"):
-                    local_path = await self._download_file(link)
-                    if local_path:
-                        return await self._sum_pdf_table_column(local_path, page_number=2)
-
-        try:
-            pre = await page.query_selector("pre")
-            if pre:
-                t = await pre.inner_text()
-                m = re.search(r'"answer"\s*:\s*"([^"]*)"', t)
-                if m:
-                    return m.group(1)
-        except Exception:
-            pass
+        hits = _find_triggers(text, {"sum_of_the", "value"})
+        if "sum_of_the" in hits and "value" in hits:
+            pdfs = list(dict.fromkeys(link for link in links if link and link.lower().endswith(".pdf")))
+            # Downloads are independent network waits; fetch them in small
+            # concurrent batches (bounding memory), and use the first PDF
+            # (in page order) that yields a total.
+            for i in range(0, len(pdfs), _MAX_CONCURRENT_DOWNLOADS):
+                batch = pdfs[i:i + _MAX_CONCURRENT_DOWNLOADS]
+                downloads = await asyncio.gather(*(self._download_file(link) for link in batch), return_exceptions=True)
+                for pdf_fp in downloads:
+                    if pdf_fp is not None and not isinstance(pdf_fp, BaseException):
+                        val = await self._sum_pdf_table_column(pdf_fp, page_number=2)
+                        if val is not None:
+                            return val
+
+        if pres:
+            m = _ANSWER_JSON_RE.search(pres[0])
+            if m:
+                return m.group(1)
 
         return None
 
-    async def _download_file(self, url: str) -> Optional[str]:
+    async def _download_file(self, url: str) -> Optional[io.BytesIO]:
+        """
+        Streams url into a BytesIO and returns it rewound, or None on
+        failure or past _MAX_DOWNLOAD_BYTES. Kept in memory: the parsers read
+        from a file object, so no temp file round-trip (or cleanup) is needed.
+        """
+        buf = io.BytesIO()
         try:
-            r = await self.client.get(url)
-            r.raise_for_status()
-            suffix = os.path.splitext(url)[1] or ""
-            fd, path = tempfile.mkstemp(suffix=suffix)
-            with os.fdopen(fd, "wb") as f:
-                f.write(r.content)
-            return path
+            async with self.client.stream("GET", url) as r:
+                r.raise_for_status()
+                # Reject oversized files before reading, and cap while
+                # streaming too since Content-Length may be absent or wrong.
+                if int(r.headers.get("content-length", "0")) > _MAX_DOWNLOAD_BYTES:
+                    raise ValueError("file too large")
+                size = 0
+                async for chunk in r.aiter_bytes(65536):
+                    size += len(chunk)
+                    if size > _MAX_DOWNLOAD_BYTES:
+                        raise ValueError("file too large")
+                    buf.write(chunk)
+            buf.seek(0)
+            return buf
         except Exception as e:
-            print("Download failed", e)
+            logger.warning("Download failed for %s: %s", url, e)
             return None
 
-    async def _sum_pdf_table_column(self, pdf_path: str, page_number: int = 2, column_name: str = "value"):
+    async def _sum_pdf_table_column(self, pdf_fp: BinaryIO, page_number: int = 2, column_name: str = "value"):
+        """
+        Runs the blocking PDF parsing and summing in a worker thread so the
+        event loop keeps serving other requests while a PDF is parsed.
+        """
+        return await asyncio.to_thread(self._sum_pdf_table_column_sync, pdf_fp, page_number, column_name)
+
+    def _sum_pdf_table_column_sync(self, pdf_fp: BinaryIO, page_number: int = 2, column_name: str = "value"):
         """
         Extracts a table from PDF page and sums a column.
-        Prints diagnostic info (columns, head, cleaned column sample, total) to logs.
+        Tries PyMuPDF's (C-backed) table finder first and falls back to
+        pdfplumber's much slower pdfminer-based detection when it finds none.
+        Logs diagnostic info (columns, head, cleaned column sample, total) at DEBUG.
         """
+        if page_number < 1:
+            return None
+
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                page_index = page_number - 1
-
-                if 0 <= page_index < len(pdf.pages):
-                    page = pdf.pages[page_index]
-                    table = page.extract_table()
-
-                    if table:
-                        df = pd.DataFrame(table[1:], columns=table[0])
-
-                        # Diagnostic logs
-                        try:
-                            print("PDF_TABLE_COLUMNS:", [c for c in df.columns])
-                            print("PDF_TABLE_HEAD:", df.head(5).to_dict())
-                        except Exception:
-                            pass
-
-                        # strip whitespace from column names
-                        df.columns = [c.strip() for c in df.columns]
-
-                        # Case-insensitive match (compare lowered names)
-                        matches = [c for c in df.columns if c.lower() == column_name.lower()]
-                        if matches:
-                            col = matches[0]
-                            # Clean numeric text
-                            cleaned = df[col].astype(str).str.replace(r"[^0-9.\-]", "", regex=True)
-                            # Diagnostic sample of cleaned values
-                            try:
-                                print("PDF_CLEANED_COLUMN_SAMPLE:", cleaned.head(10).tolist())
-                            except Exception:
-                                pass
-                            df[col] = pd.to_numeric(cleaned, errors="coerce")
-                            total = df[col].sum(skipna=True)
-                            # Diagnostic total
-                            print("COMPUTED_TOTAL:", total, "type:", type(total).__name__)
-                            if pd.isna(total):
-                                return None
-                            if abs(total - round(total)) < 1e-4:
-                                return int(round(total))
-                            return float(total)
-
-                        # Fallback: sum numeric columns
-                        numeric = df.apply(
-                            lambda s: pd.to_numeric(
-                                s.astype(str).str.replace(r"[^0-9.\-]", "", regex=True),
-                                errors="coerce",
-                            )
-                        )
-                        row_sums = numeric.sum(axis=1, skipna=True)
-                        total = row_sums.sum(skipna=True)
-                        print("COMPUTED_TOTAL_FALLBACK:", total, "type:", type(total).__name__)
-                        if pd.isna(total):
-                            return None
-                        if abs(total - round(total)) < 1e-4:
-                            return int(round(total))
-                        return float(total)
+            table = self._extract_table_pymupdf(pdf_fp, page_number)
+        except Exception as e:
+            logger.debug("PyMuPDF table extraction failed: %s", e)
+            table = None
 
-            return None
+        try:
+            if table is None:
+                table = self._extract_table_pdfplumber(pdf_fp, page_number)
+            if not table:
+                return None
+
+            header = [str(c or "").strip() for c in table[0]]
+            rows = table[1:]
+
+            # Diagnostic logs (guarded so production skips building them)
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug("PDF_TABLE_COLUMNS: %s", header)
+                logger.debug("PDF_TABLE_HEAD: %s", rows[:5])
+
+            # Case-insensitive match (compare lowered names)
+            wanted = column_name.lower()
+            col = next((i for i, c in enumerate(header) if c.lower() == wanted), None)
+            if col is not None:
+                cells = [row[col] if col < len(row) else None for row in rows]
+                if debug:
+                    logger.debug("PDF_CLEANED_COLUMN_SAMPLE: %s", [str(c).translate(_NUM_KEEP_TABLE) for c in cells[:10]])
+                values = np.fromiter((_parse_number(c) for c in cells), dtype=float, count=len(cells))
+                total = np.nansum(values)
+                if debug:
+                    logger.debug("COMPUTED_TOTAL: %s type: %s", total, type(total).__name__)
+                return self._normalize_total(total)
+
+            # Fallback (no matching column): sum every numeric cell
+            values = np.fromiter((_parse_number(c) for row in rows for c in row), dtype=float)
+            total = np.nansum(values)
+            if debug:
+                logger.debug("COMPUTED_TOTAL_FALLBACK: %s type: %s", total, type(total).__name__)
+            return self._normalize_total(total)
         except Exception as e:
-            print("PDF parsing failed", e)
+            logger.warning("PDF parsing failed: %s", e)
+            return None
+
+    @staticmethod
+    def _extract_table_pdfplumber(pdf_fp: BinaryIO, page_number: int):
+        """Returns the first table on the page as a list of rows, or None."""
+        # Only load the requested page; pdfplumber would otherwise build
+        # Page objects for the whole document.
+        pdf_fp.seek(0)
+        with pdfplumber.open(pdf_fp, pages=[page_number]) as pdf:
+            if not pdf.pages:
+                return None
+            return pdf.pages[0].extract_table()
+
+    @staticmethod
+    def _extract_table_pymupdf(pdf_fp: BinaryIO, page_number: int):
+        """
+        Returns the largest table PyMuPDF's TableFinder detects on the page as
+        a list of rows (same shape and choice as pdfplumber's extract_table),
+        or None when there is none.
+        """
+        pdf_fp.seek(0)
+        with pymupdf.open(stream=pdf_fp.read(), filetype="pdf") as doc:
+            if page_number > doc.page_count:
+                return None
+            tables = doc[page_number - 1].find_tables().tables
+            if not tables:
+                return None
+            largest = max(tables, key=lambda t: t.row_count * t.col_count)
+            return largest.extract()
+
+    @staticmethod
+    def _normalize_total(total):
+        """Returns None for NaN, an int for whole numbers, otherwise a float."""
+        if math.isnan(total):
             return None
+        if abs(total - round(total)) < 1e-4:
+            return int(round(total))
+        return float(total)
@@ -0,0 +1,20 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # Session-scoped async fixtures need a loop that outlives a single test.
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client():
+    """One HTTP client (and its keep-alive pool) shared by every test."""
+    async with httpx.AsyncClient(http2=True, limits=httpx.Limits(max_keepalive_connections=20)) as client:
+        yield client
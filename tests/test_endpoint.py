@@ -1,11 +1,16 @@
-import asyncio
 import httpx
+import pytest
+from fastapi.testclient import TestClient
 
+from app.config import settings
+from app.main import app
 
-async def test_demo_endpoint():
+
+@pytest.mark.asyncio
+async def test_demo_endpoint(http_client):
     """
     Simple test to verify the /quiz endpoint accepts the demo payload.
-    Run locally with: pytest -q
+    Needs the server running locally (python run.py); skipped otherwise.
     """
     url = "https://tds-llm-analysis.s-anand.net/demo"
 
@@ -15,6 +20,41 @@ async def test_demo_endpoint():
         "url": url,
     }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.post("http://localhost:8000/quiz", json=payload)
-        assert r.status_code in (200, 403, 400)
+    try:
+        r = await http_client.post("http://localhost:8000/quiz", json=payload)
+    except httpx.ConnectError:
+        pytest.skip("no server running on localhost:8000")
+    assert r.status_code in (200, 403, 400)
+
+
+# Offline checks of /quiz request validation. The client is not used as a
+# context manager, so the lifespan (and Chromium) never starts.
+client = TestClient(app)
+
+
+def test_rejects_oversized_content_length():
+    r = client.post("/quiz", content=b"x" * (settings.MAX_PAYLOAD_BYTES + 1))
+    assert r.status_code == 413
+
+
+def test_rejects_oversized_chunked_body():
+    # A generator body is sent chunked, without a Content-Length header.
+    body = iter([b"x" * settings.MAX_PAYLOAD_BYTES, b"x"])
+    r = client.post("/quiz", content=body)
+    assert r.status_code == 413
+
+
+def test_rejects_invalid_json():
+    r = client.post("/quiz", content=b"{not json")
+    assert r.status_code == 400
+
+
+def test_rejects_missing_fields():
+    r = client.post("/quiz", json={"email": settings.EMAIL, "secret": settings.SECRET})
+    assert r.status_code == 400
+
+
+def test_rejects_wrong_secret():
+    payload = {"email": settings.EMAIL, "secret": settings.SECRET + "x", "url": "https://example.com"}
+    r = client.post("/quiz", json=payload)
+    assert r.status_code == 403
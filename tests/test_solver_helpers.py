@@ -0,0 +1,146 @@
+import base64
+import io
+import math
+
+import httpx
+import pymupdf
+import pytest
+
+import solver.solver as solver_module
+from solver.solver import QuizSolver, _parse_number
+
+
+def test_parse_number_strips_noise():
+    assert _parse_number("$1,234.50") == 1234.5
+    assert _parse_number(" -7 ") == -7.0
+    assert _parse_number("1 000") == 1000.0
+    assert _parse_number(12) == 12.0
+
+
+def test_parse_number_returns_nan_when_not_numeric():
+    assert math.isnan(_parse_number("n/a"))
+    assert math.isnan(_parse_number(None))
+    assert math.isnan(_parse_number(""))
+
+
+def test_find_json_in_pres_parses_json_shapes():
+    assert QuizSolver._find_json_in_pres(['  {"answer": 42} ']) == {"answer": 42}
+    assert QuizSolver._find_json_in_pres(["[1, 2]"]) == [1, 2]
+    assert QuizSolver._find_json_in_pres(['<b>{"url": "a.pdf"}</b>']) == {"url": "a.pdf"}
+
+
+def test_find_json_in_pres_decodes_base64():
+    blob = base64.b64encode(b'{"answer": "x"}').decode()
+    assert QuizSolver._find_json_in_pres([blob[:10] + "\n" + blob[10:]]) == {"answer": "x"}
+
+
+def test_find_json_in_pres_falls_back_to_answer_patterns():
+    assert QuizSolver._find_json_in_pres(['{"answer": "7", broken']) == {"answer": "7"}
+    assert QuizSolver._find_json_in_pres(["answer: 12"]) == {"answer": "12"}
+
+
+def test_find_json_in_pres_skips_non_matching_blocks():
+    assert QuizSolver._find_json_in_pres(["hello world", "{broken", '{"answer": 1}']) == {"answer": 1}
+    assert QuizSolver._find_json_in_pres(["hello world"]) is None
+    assert QuizSolver._find_json_in_pres([]) is None
+
+
+def _solver(handler) -> QuizSolver:
+    """QuizSolver whose HTTP client is served by handler instead of the network."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return QuizSolver("a@b.c", "secret", "https://quiz.test/", client=client)
+
+
+@pytest.mark.asyncio
+async def test_solve_from_json_blob_ignores_non_string_urls():
+    solver = _solver(lambda request: httpx.Response(404))
+    assert await solver._solve_from_json_blob({"url": 5}, None) is None
+    assert await solver._solve_from_json_blob({"file": ["a.pdf"]}, None) is None
+
+
+@pytest.mark.asyncio
+async def test_download_file_rejects_oversized_content_length(monkeypatch):
+    monkeypatch.setattr(solver_module, "_MAX_DOWNLOAD_BYTES", 10)
+    solver = _solver(lambda request: httpx.Response(200, headers={"Content-Length": "11"}, content=b"x"))
+    assert await solver._download_file("https://files.test/a.pdf") is None
+
+
+@pytest.mark.asyncio
+async def test_download_file_caps_streamed_body(monkeypatch):
+    monkeypatch.setattr(solver_module, "_MAX_DOWNLOAD_BYTES", 10)
+    solver = _solver(lambda request: httpx.Response(200, headers={"Content-Length": "3"}, content=b"x" * 100))
+    assert await solver._download_file("https://files.test/a.pdf") is None
+
+
+@pytest.mark.asyncio
+async def test_download_file_returns_none_on_http_error():
+    solver = _solver(lambda request: httpx.Response(404))
+    assert await solver._download_file("https://files.test/a.pdf") is None
+
+
+@pytest.mark.asyncio
+async def test_heuristic_skips_failed_downloads_across_batches(monkeypatch):
+    monkeypatch.setattr(solver_module, "_MAX_CONCURRENT_DOWNLOADS", 1)
+
+    def handler(request):
+        if request.url.path == "/bad.pdf":
+            return httpx.Response(404)
+        return httpx.Response(200, content=b"42")
+
+    async def fake_sum(pdf_fp, page_number=2, column_name="value"):
+        return int(pdf_fp.read())
+
+    solver = _solver(handler)
+    monkeypatch.setattr(solver, "_sum_pdf_table_column", fake_sum)
+    links = ["https://files.test/bad.pdf", "https://files.test/good.pdf"]
+    assert await solver._heuristic_solve_text("What is the sum of the value column?", links, []) == 42
+
+
+def _ruled_table_pdf(rows) -> io.BytesIO:
+    """Two-page PDF with rows drawn as a fully ruled table on page 2."""
+    doc = pymupdf.open()
+    doc.new_page()
+    page = doc.new_page()
+    x0, y0, cell_w, cell_h = 72, 72, 120, 24
+    n_cols = len(rows[0])
+    for r in range(len(rows) + 1):
+        y = y0 + r * cell_h
+        page.draw_line((x0, y), (x0 + n_cols * cell_w, y))
+    for c in range(n_cols + 1):
+        x = x0 + c * cell_w
+        page.draw_line((x, y0), (x, y0 + len(rows) * cell_h))
+    for r, row in enumerate(rows):
+        for c, text in enumerate(row):
+            page.insert_text((x0 + c * cell_w + 4, y0 + r * cell_h + 16), text, fontsize=10)
+    fp = io.BytesIO(doc.tobytes())
+    doc.close()
+    return fp
+
+
+_VALUE_ROWS = [["item", "value"], ["a", "$1,000"], ["b", "25.5"], ["c", "n/a"], ["d", "-3"]]
+
+
+def test_sum_pdf_table_column_sums_value_column():
+    solver = _solver(lambda request: httpx.Response(404))
+    assert solver._sum_pdf_table_column_sync(_ruled_table_pdf(_VALUE_ROWS), 2) == 1022.5
+
+
+def test_sum_pdf_table_column_falls_back_to_all_cells():
+    rows = [["item", "amount"], ["1", "$1,000"], ["2", "-3"]]
+    solver = _solver(lambda request: httpx.Response(404))
+    assert solver._sum_pdf_table_column_sync(_ruled_table_pdf(rows), 2) == 1000
+
+
+def test_sum_pdf_table_column_rejects_missing_pages():
+    solver = _solver(lambda request: httpx.Response(404))
+    assert solver._sum_pdf_table_column_sync(_ruled_table_pdf(_VALUE_ROWS), 0) is None
+    assert solver._sum_pdf_table_column_sync(_ruled_table_pdf(_VALUE_ROWS), 3) is None
+
+
+def test_sum_pdf_table_column_falls_back_to_pdfplumber(monkeypatch):
+    def broken(pdf_fp, page_number):
+        raise RuntimeError("no table finder")
+
+    monkeypatch.setattr(QuizSolver, "_extract_table_pymupdf", staticmethod(broken))
+    solver = _solver(lambda request: httpx.Response(404))
+    assert solver._sum_pdf_table_column_sync(_ruled_table_pdf(_VALUE_ROWS), 2) == 1022.5